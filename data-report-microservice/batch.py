@@ -0,0 +1,209 @@
+import os
+import sys
+import glob
+import time
+import signal
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import engine
+
+try:
+    import resource
+except ImportError: # not available on Windows, memory limits are skipped
+    resource = None
+
+class ReportTimeout(BaseException):
+    """
+    Raised inside a worker when a report takes longer than its timeout.
+
+    Derives from BaseException so the engine's "except Exception" fallbacks
+    (e.g. around sidecar reads and writes) cannot swallow it.
+    """
+
+def collect_csv_files(inputs):
+    """
+    Expand directories and glob patterns into a sorted list of CSV files.
+    """
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "*.csv"))
+        else:
+            matches = glob.glob(item)
+        files.update(path for path in matches if path.lower().endswith(".csv") and os.path.isfile(path))
+    return sorted(files)
+
+def report_paths(csv_files, output_dir):
+    """
+    Map each CSV file to its report path, keeping the directories below the
+    common root so files with the same name in different directories do not
+    overwrite each other's reports.
+    """
+    if not csv_files:
+        return {}
+    abs_paths = [os.path.abspath(path) for path in csv_files]
+    root = os.path.commonpath([os.path.dirname(path) for path in abs_paths])
+    return {path: os.path.join(output_dir, os.path.splitext(os.path.relpath(abs_path, root))[0] + ".report.txt")
+            for path, abs_path in zip(csv_files, abs_paths)}
+
+def init_worker(memory_limit_mb):
+    """
+    Apply the per-process memory limit in a newly started worker.
+    """
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def raise_timeout(signum, frame):
+    """
+    Signal handler that aborts the current report.
+    """
+    raise ReportTimeout()
+
+def run_job(csv_path, output_path, timeout, use_sidecar, optimize=True, usecols=None):
+    """
+    Generate and save the report for one CSV file inside a worker process.
+
+    This function:
+    - arms an alarm so the report is aborted after the timeout
+    - generates the report with the headless engine
+    - writes it to output_path
+    - returns a result record instead of raising
+    """
+    start = time.perf_counter()
+    result = {"path": csv_path,
+              "bytes": 0,
+              "status": "done",
+              "error": None,
+              "output": None}
+
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, raise_timeout)
+        signal.alarm(timeout)
+
+    try:
+        result["bytes"] = os.path.getsize(csv_path)
+        report = engine.generate_report(csv_path, use_sidecar, optimize=optimize, usecols=usecols)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w") as f:
+            f.write(report)
+        result["output"] = output_path
+    except ReportTimeout:
+        result["status"] = "timeout"
+        result["error"] = f"exceeded {timeout}s"
+    except MemoryError:
+        result["status"] = "failed"
+        result["error"] = "exceeded memory limit"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def run_batch(csv_files,
+              output_dir,
+              workers=None,
+              timeout=None,
+              memory_limit_mb=None,
+              use_sidecar=True,
+              optimize=True,
+              usecols=None):
+    """
+    Generate reports for many CSV files in parallel.
+
+    Returns the per-file results and the total wall time.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = report_paths(csv_files, output_dir)
+    results = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=init_worker,
+                             initargs=(memory_limit_mb,)) as executor:
+        futures = {executor.submit(run_job, path, outputs[path], timeout, use_sidecar, optimize, usecols): path
+                   for path in csv_files}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                # a worker died (e.g. killed for exceeding memory)
+                result = {"path": futures[future],
+                          "bytes": 0,
+                          "status": "failed",
+                          "error": f"worker crashed: {e}",
+                          "output": None,
+                          "seconds": 0.0}
+            results.append(result)
+            print(f"[{result['status']:7}] {result['path']} ({result['seconds']:.2f}s)"
+                  + (f" - {result['error']}" if result["error"] else ""))
+
+    return results, time.perf_counter() - start
+
+def print_summary(results, elapsed):
+    """
+    Print the number of reports per status and the overall throughput.
+    """
+    done = [r for r in results if r["status"] == "done"]
+    total_mb = sum(r["bytes"] for r in done) / (1024 * 1024)
+
+    print("\n" + "=" * 60)
+    print("batch summary")
+    print("=" * 60)
+    for status in ("done", "failed", "timeout"):
+        print(f"{status:8}: {sum(1 for r in results if r['status'] == status)}")
+    print(f"wall time: {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"throughput: {len(done) / elapsed:.2f} files/s, {total_mb / elapsed:.2f} MB/s")
+    print("=" * 60)
+
+def main():
+    """
+    Parse command line arguments and run the batch.
+    """
+    parser = argparse.ArgumentParser(description="Generate CSV reports in parallel without a GUI")
+    parser.add_argument("inputs", nargs="+",
+                        help="CSV files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="reports",
+                        help="directory for the generated reports (default: reports)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("-t", "--timeout", type=int, default=None,
+                        help="per-file timeout in seconds")
+    parser.add_argument("-m", "--memory-limit", type=int, default=None,
+                        help="per-worker memory limit in MB")
+    parser.add_argument("--no-sidecar", action="store_true",
+                        help="always parse the CSV instead of using the columnar sidecar")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="keep pandas' default dtypes and skip the memory footprint section")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="only read these columns")
+    args = parser.parse_args()
+
+    csv_files = collect_csv_files(args.inputs)
+    if not csv_files:
+        print("no CSV files found")
+        sys.exit(1)
+
+    print(f"generating {len(csv_files)} report(s)...")
+    results, elapsed = run_batch(csv_files,
+                                 args.output_dir,
+                                 workers=args.workers,
+                                 timeout=args.timeout,
+                                 memory_limit_mb=args.memory_limit,
+                                 use_sidecar=not args.no_sidecar,
+                                 optimize=not args.no_optimize,
+                                 usecols=args.columns)
+    print_summary(results, elapsed)
+
+    if any(r["status"] != "done" for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
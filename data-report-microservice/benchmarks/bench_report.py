@@ -0,0 +1,288 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError: # not available on Windows, peak RSS is not reported
+    resource = None
+
+# make the service modules importable when run from any directory
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+import engine
+import sidecar
+
+SHAPES = {"narrow": 4, "wide": 64}
+KINDS = ("numeric", "string", "mixed")
+PATHS = ("parser", "preview", "cold", "warm")
+# paths that consume the whole file, so MB/s of the CSV means something
+FULL_READ_PATHS = ("parser", "cold")
+GENERATE_CHUNK_ROWS = 1_000_000
+
+def available_parser_engines():
+    """
+    Return the pandas CSV parser engines usable in this environment.
+    """
+    engines = ["c", "python"]
+    try:
+        import pyarrow # noqa: F401
+        engines.append("pyarrow")
+    except ImportError:
+        pass
+    return engines
+
+def make_chunk(rng, start, rows, columns, kind, null_fraction):
+    """
+    Build one chunk of synthetic data.
+
+    Mixed datasets alternate integer, float and string columns, string
+    columns draw from a small vocabulary so they exercise categoricals.
+    """
+    data = {"id": np.arange(start, start + rows)}
+    for i in range(columns - 1):
+        column_kind = kind if kind != "mixed" else ("int", "float", "string")[i % 3]
+        if column_kind in ("numeric", "float"):
+            values = rng.normal(size=rows)
+        elif column_kind == "int":
+            values = rng.integers(0, 1000, size=rows).astype(float)
+        else:
+            values = rng.choice(np.array([f"value_{n}" for n in range(50)], dtype=object), size=rows)
+        if null_fraction:
+            values[rng.random(rows) < null_fraction] = None if values.dtype == object else np.nan
+        data[f"col_{i}"] = values
+    return pd.DataFrame(data)
+
+def generate_csv(path, rows, columns, kind, null_fraction, seed=0):
+    """
+    Write a synthetic CSV file in chunks so huge row counts fit in memory.
+    """
+    rng = np.random.default_rng(seed)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", newline="") as f:
+        for start in range(0, rows, GENERATE_CHUNK_ROWS):
+            count = min(GENERATE_CHUNK_ROWS, rows - start)
+            chunk = make_chunk(rng, start, count, columns, kind, null_fraction)
+            chunk.to_csv(f, index=False, header=start == 0)
+    os.replace(temp_path, path)
+
+def dataset_path(data_dir, rows, shape, kind, null_fraction):
+    """
+    Return the file name of a synthetic dataset, so datasets are reused across runs.
+    """
+    return os.path.join(data_dir, f"{kind}_{shape}_{rows}_nulls{null_fraction:g}.csv")
+
+def peak_rss_bytes():
+    """
+    Return the peak resident set size of this process in bytes.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run_path(csv_path, path, parser_engine):
+    """
+    Run one benchmarked code path and return its result.
+
+    parser is the bare pandas parse used as a baseline, the other paths are
+    the engine's generate_report as the services call it.
+    """
+    if path == "parser":
+        return pd.read_csv(csv_path, engine=parser_engine)
+    if path == "preview":
+        # no sidecar and no footprint, so only the preview rows are parsed
+        return engine.generate_report(csv_path, use_sidecar=False, optimize=False)
+    return engine.generate_report(csv_path, use_sidecar=True)
+
+def measure(csv_path, path, parser_engine, results):
+    """
+    Time one code path in a fresh worker process and report wall time and peak RSS.
+    """
+    baseline_rss = peak_rss_bytes()
+    start = time.perf_counter()
+    run_path(csv_path, path, parser_engine)
+    elapsed = time.perf_counter() - start
+    results.put({"wall_seconds": elapsed,
+                 "peak_rss_bytes": peak_rss_bytes(),
+                 "baseline_rss_bytes": baseline_rss})
+
+def build_sidecar(csv_path, timeout):
+    """
+    Build the sidecar through the engine in a spawned process, like a service would.
+    """
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=engine.load_dataset, args=(csv_path,))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    return sidecar.is_fresh(csv_path)
+
+def run_measurement(csv_path, path, parser_engine, timeout):
+    """
+    Run a measurement in a spawned process, so peak RSS is not shared between runs.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=measure, args=(csv_path, path, parser_engine, results))
+    process.start()
+    process.join(timeout)
+
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return {"status": "timeout"}
+    if process.exitcode != 0:
+        return {"status": "failed", "exitcode": process.exitcode}
+    result = results.get()
+    result["status"] = "ok"
+    return result
+
+def benchmark_cases(args):
+    """
+    Yield every (rows, shape, kind, path, engine) combination to measure.
+    """
+    parser_engines = [e for e in args.engines if e in available_parser_engines()]
+    for rows in args.rows:
+        for shape in args.shapes:
+            for kind in args.kinds:
+                for path in args.paths:
+                    if path == "parser":
+                        for parser_engine in parser_engines:
+                            yield rows, shape, kind, path, parser_engine
+                    elif path in ("preview", "cold"):
+                        yield rows, shape, kind, path, "c"
+                    else:
+                        layout = "feather" if sidecar.pa is not None else "npy"
+                        yield rows, shape, kind, path, f"sidecar-{layout}"
+
+def run_benchmarks(args):
+    """
+    Generate the datasets and run every benchmark case.
+
+    This function:
+    - generates missing synthetic CSV files in the data directory
+    - removes the sidecar before every cold run, so each one parses the CSV
+      and writes a new sidecar as a service would
+    - builds the sidecar in a separate process before timing the warm path
+    - keeps the fastest of the repeated runs for each case
+    """
+    os.makedirs(args.data_dir, exist_ok=True)
+    records = []
+
+    for rows, shape, kind, path, parser_engine in benchmark_cases(args):
+        csv_path = os.path.abspath(dataset_path(args.data_dir, rows, shape, kind, args.null_fraction))
+        if not os.path.exists(csv_path):
+            print(f"generating {os.path.basename(csv_path)}...", file=sys.stderr)
+            generate_csv(csv_path, rows, SHAPES[shape], kind, args.null_fraction)
+        file_bytes = os.path.getsize(csv_path)
+        runs = []
+        if path == "warm" and not sidecar.is_fresh(csv_path) and not build_sidecar(csv_path, args.timeout):
+            # timing now would measure a cold parse under the warm label
+            runs.append({"status": "failed", "error": "could not build the sidecar"})
+        else:
+            for _ in range(args.repeat):
+                if path == "cold":
+                    shutil.rmtree(sidecar.sidecar_path(csv_path), ignore_errors=True)
+                runs.append(run_measurement(csv_path, path, parser_engine, args.timeout))
+        ok_runs = [run for run in runs if run["status"] == "ok"]
+
+        record = {"rows": rows,
+                  "shape": shape,
+                  "columns": SHAPES[shape],
+                  "kind": kind,
+                  "null_fraction": args.null_fraction,
+                  "file_bytes": file_bytes,
+                  "path": path,
+                  "engine": parser_engine,
+                  "repeat": args.repeat}
+        if ok_runs:
+            best = min(ok_runs, key=lambda run: run["wall_seconds"])
+            record.update(status="ok",
+                          wall_seconds=best["wall_seconds"],
+                          peak_rss_bytes=max(run["peak_rss_bytes"] or 0 for run in ok_runs) or None,
+                          baseline_rss_bytes=best["baseline_rss_bytes"],
+                          throughput_mb_s=(file_bytes / (1024 * 1024) / best["wall_seconds"]
+                                           if path in FULL_READ_PATHS else None))
+        else:
+            record["status"] = runs[0]["status"]
+            if "error" in runs[0]:
+                record["error"] = runs[0]["error"]
+
+        print(f"{kind:7} {shape:6} {rows:>11} {path:8} {parser_engine:15} "
+              + (f"{record['wall_seconds']:8.3f}s "
+                 + (f"{record['throughput_mb_s']:9.1f} MB/s" if record["throughput_mb_s"] is not None else "")
+                 if ok_runs else record["status"]),
+              file=sys.stderr)
+        records.append(record)
+
+    return records
+
+def environment_info():
+    """
+    Return version information so results can be compared across runs.
+    """
+    info = {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "pyarrow": None,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    if sidecar.pa is not None:
+        info["pyarrow"] = sidecar.pa.__version__
+    return info
+
+def main():
+    """
+    Parse command line arguments, run the benchmarks and write the JSON results.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark CSV report generation")
+    parser.add_argument("--rows", nargs="+", type=lambda v: int(float(v)),
+                        default=[10**3, 10**4, 10**5, 10**6],
+                        help="row counts to generate, e.g. 1e3 1e6 1e8 (default: 1e3 1e4 1e5 1e6)")
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--engines", nargs="+", default=available_parser_engines(),
+                        help="pandas parser engines for the parser path")
+    parser.add_argument("--null-fraction", type=float, default=0.05,
+                        help="share of values replaced by nulls (default: 0.05)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case, the fastest is kept (default: 3)")
+    parser.add_argument("--timeout", type=float, default=600,
+                        help="seconds before a single run is abandoned (default: 600)")
+    parser.add_argument("--data-dir", default="bench_data",
+                        help="directory for the synthetic CSV files (default: bench_data)")
+    parser.add_argument("-o", "--output",
+                        help="file for the JSON results (default: stdout)")
+    args = parser.parse_args()
+
+    # the sidecar cache lives next to the synthetic data
+    output_path = os.path.abspath(args.output) if args.output else None
+    os.makedirs(args.data_dir, exist_ok=True)
+    args.data_dir = os.path.abspath(args.data_dir)
+    os.chdir(args.data_dir)
+
+    output = {"environment": environment_info(),
+              "results": run_benchmarks(args)}
+    text = json.dumps(output, indent=2)
+    if output_path:
+        with open(output_path, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import time
+import argparse
+import threading
+import multiprocessing
+import engine
+import spool
+import watch
+import pubsub
+
+class ReportRequestHandler:
+    """
+    Compatibility shim that queues CSV file paths written to report.txt.
+    """
+
+    def __init__(self, request_file="report.txt", spool_dir=spool.SPOOL_DIR):
+        self.spool_dir = spool_dir
+        self.last_content = ""
+        self.lock = threading.Lock()
+        self.watcher = watch.WatchedFile(request_file, self.process_request_content)
+
+    def process_request_content(self, content):
+        """
+        Process the content of the request file when modifications are detected.
+
+        This function:
+        - queues a request if the content is a new CSV file path
+        - waits for the result in the background and writes it back
+        """
+        try:
+            with self.lock:
+                # only process if content changed and is not empty
+                if not content or content == self.last_content:
+                    return
+                self.last_content = content
+
+            if engine.is_csv_request(content):
+                request_id = spool.submit(content, self.spool_dir)
+                print(f"CSV file path detected: {content} (request {request_id})")
+                threading.Thread(target=self.write_back,
+                                 args=(request_id, content),
+                                 daemon=True).start()
+            elif not engine.is_report(content):
+                print("invalid CSV file path detected")
+
+        except Exception as e:
+            print(f"error processing request file: {e}")
+
+    def write_back(self, request_id, csv_path):
+        """
+        Wait for a queued request and write its report to the request file.
+        """
+        state, result = spool.wait(request_id, spool_dir=self.spool_dir)
+        if state != "done":
+            print(f"failed to generate report for {csv_path}: {result}")
+            return
+
+        with self.lock:
+            # a newer path may have been written while this one was running
+            if self.last_content != csv_path:
+                return
+            self.last_content = result.strip()
+            self.watcher.write(result)
+        print(f"report generated for {csv_path}")
+
+def process_request(request, spool_dir, use_sidecar, optimize=True):
+    """
+    Generate the report for one claimed request, record the outcome and
+    return the result message for subscribers.
+    """
+    report_path = spool.result_path(request["id"], spool_dir)
+    try:
+        report = engine.generate_report(request["path"], use_sidecar, optimize=optimize)
+        spool.complete(request["id"], report, spool_dir)
+        print(f"[done   ] {request['id']} {request['path']}")
+        return pubsub.make_message(request["id"], "done", request["path"],
+                                   report=report, report_path=report_path)
+    except Exception as e:
+        spool.fail(request["id"], str(e), spool_dir)
+        print(f"[failed ] {request['id']} {request['path']} - {e}")
+        return pubsub.make_message(request["id"], "failed", request["path"],
+                                   report_path=report_path, error=str(e))
+
+def worker_loop(spool_dir, use_sidecar, poll_interval, stop_event, results=None, optimize=True):
+    """
+    Drain the spool queue until asked to stop.
+
+    Any number of these loops (in this or other daemons) can share one
+    spool, since requests are claimed with an atomic rename.
+    """
+    try:
+        while not stop_event.is_set():
+            request = spool.claim(spool_dir)
+            if request is None:
+                stop_event.wait(poll_interval)
+                continue
+            message = process_request(request, spool_dir, use_sidecar, optimize)
+            if results is not None:
+                results.put(message)
+    except KeyboardInterrupt:
+        pass # the parent daemon handles shutdown
+
+def run_daemon(request_file="report.txt",
+               spool_dir=spool.SPOOL_DIR,
+               workers=1,
+               use_sidecar=True,
+               poll_interval=0.2,
+               requeue=False,
+               socket_path=pubsub.SOCKET_PATH,
+               optimize=True):
+    """
+    Run the headless report daemon.
+
+    This function:
+    - starts the result publisher if a socket path is given
+    - starts worker processes that drain the spool queue
+    - sets up a debounced watcher on report.txt for the single-file mode
+    - processes an existing request on startup
+    - runs continuously until interrupted
+    """
+    spool.ensure_spool(spool_dir)
+    if requeue:
+        print(f"requeued {spool.requeue_running(spool_dir)} interrupted request(s)")
+
+    publisher = None
+    results = None
+    forwarder = None
+    if socket_path and pubsub.is_supported():
+        try:
+            publisher = pubsub.ResultPublisher(socket_path)
+            publisher.start()
+            results = multiprocessing.Queue()
+            forwarder = threading.Thread(target=pubsub.publish_results,
+                                         args=(publisher, results),
+                                         daemon=True)
+            forwarder.start()
+            print(f"publishing results on {socket_path}")
+        except OSError as e:
+            print(f"error starting result publisher: {e}")
+            publisher = None
+
+    stop_event = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=worker_loop,
+                                         args=(spool_dir, use_sidecar, poll_interval, stop_event, results, optimize),
+                                         daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    event_handler = ReportRequestHandler(request_file, spool_dir)
+    event_handler.watcher.start()
+
+    print(f"report daemon with {workers} worker(s) draining {spool_dir}/ "
+          f"and monitoring {request_file} for CSV file paths...")
+
+    try:
+        event_handler.watcher.check()
+
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_event.set()
+
+    event_handler.watcher.stop()
+    for process in processes:
+        process.join()
+    if publisher:
+        results.put(None)
+        forwarder.join()
+        publisher.stop()
+
+def main():
+    """
+    Parse command line arguments and start the daemon.
+    """
+    parser = argparse.ArgumentParser(description="Headless CSV report daemon")
+    parser.add_argument("--request-file", default="report.txt",
+                        help="file watched for CSV file paths (default: report.txt)")
+    parser.add_argument("--spool-dir", default=spool.SPOOL_DIR,
+                        help="spool directory for queued requests (default: spool)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes draining the queue (default: 1)")
+    parser.add_argument("--requeue", action="store_true",
+                        help="requeue requests left running by a previous daemon")
+    parser.add_argument("--socket", default=pubsub.SOCKET_PATH,
+                        help="Unix-domain socket for pushing results to subscribers (default: report.sock)")
+    parser.add_argument("--no-publish", action="store_true",
+                        help="do not push results to subscribers")
+    parser.add_argument("--no-sidecar", action="store_true",
+                        help="always parse the CSV instead of using the columnar sidecar")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="keep pandas' default dtypes and skip the memory footprint section")
+    args = parser.parse_args()
+
+    run_daemon(args.request_file,
+               spool_dir=args.spool_dir,
+               workers=args.workers,
+               use_sidecar=not args.no_sidecar,
+               requeue=args.requeue,
+               socket_path=None if args.no_publish else args.socket,
+               optimize=not args.no_optimize)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+SAMPLE_ROWS = 10_000
+
+# string columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+
+# dtype pandas gives string columns by default (object, or str on pandas 3)
+DEFAULT_STRING_DTYPE = pd.Series(["a"]).dtype
+
+def is_string_column(series):
+    """
+    Check if an object column holds only strings (and nulls).
+    """
+    values = series.dropna()
+    return values.map(type).eq(str).all()
+
+def is_text_dtype(series):
+    """
+    Check if a column uses one of pandas' plain string dtypes.
+    """
+    return series.dtype == object or (pd.api.types.is_string_dtype(series)
+                                      and not isinstance(series.dtype, pd.CategoricalDtype))
+
+def is_low_cardinality(series):
+    """
+    Check if a string column repeats its values enough to be stored as a categorical.
+    """
+    return (len(series) > 0
+            and series.nunique() <= CATEGORY_RATIO * len(series)
+            and is_string_column(series))
+
+def downcast_numeric(series):
+    """
+    Return a numeric column with the smallest dtype that holds its values exactly.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        kind = "unsigned" if len(series) and series.min() >= 0 else "integer"
+        return pd.to_numeric(series, downcast=kind)
+    if pd.api.types.is_float_dtype(series):
+        narrow = series.astype(np.float32)
+        lossless = (narrow.astype(series.dtype) == series) | series.isna()
+        return narrow if lossless.all() else series
+    return series
+
+def downcast_frame(df):
+    """
+    Return a copy of the DataFrame with compact dtypes.
+
+    This function:
+    - down-casts integer columns to the smallest integer type
+    - down-casts float columns to float32 when no precision is lost
+    - converts low-cardinality string columns to categoricals
+    """
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        if is_text_dtype(series) and is_low_cardinality(series):
+            columns[name] = series.astype("category")
+        else:
+            columns[name] = downcast_numeric(series)
+    return pd.DataFrame(columns, index=df.index)
+
+def infer_dtypes(csv_path, usecols=None, sample_rows=SAMPLE_ROWS):
+    """
+    Infer explicit dtypes for the full read from a sample of the CSV file.
+
+    Only string columns that look low-cardinality in the sample are given a
+    dtype (category), since a category accepts any value found later in the
+    file. Numeric columns are left to the parser and down-cast once the whole
+    file is read, because a sample cannot prove that later values fit a
+    narrower type.
+    """
+    sample = pd.read_csv(csv_path, nrows=sample_rows, usecols=usecols)
+    return {name: "category"
+            for name in sample.columns
+            if is_text_dtype(sample[name]) and is_low_cardinality(sample[name])}
+
+def downcast_numerics(df):
+    """
+    Down-cast the numeric columns of a DataFrame, leaving the others as they are.
+    """
+    return pd.DataFrame({name: downcast_numeric(df[name]) for name in df.columns},
+                        index=df.index)
+
+def concat_chunks(chunks):
+    """
+    Concatenate parsed chunks without losing categoricals.
+
+    Each chunk has its own categories, which pd.concat would turn back into
+    strings, so every categorical column is first given the union of them.
+    """
+    for name in chunks[0].columns:
+        if isinstance(chunks[0][name].dtype, pd.CategoricalDtype):
+            categories = union_categoricals([chunk[name] for chunk in chunks]).categories
+            dtype = pd.CategoricalDtype(categories)
+            for chunk in chunks:
+                chunk[name] = chunk[name].astype(dtype)
+    return pd.concat(chunks, ignore_index=True)
+
+def drop_high_cardinality(df):
+    """
+    Turn categoricals with too many distinct values back into plain strings.
+
+    infer_dtypes only sees a sample, so a column that repeats its values
+    early on can turn out to be mostly unique over the whole file.
+    """
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        if (isinstance(series.dtype, pd.CategoricalDtype)
+                and len(series.cat.categories) > CATEGORY_RATIO * len(series)):
+            series = series.astype(DEFAULT_STRING_DTYPE)
+        columns[name] = series
+    return pd.DataFrame(columns, index=df.index)
+
+def default_column_bytes(series):
+    """
+    Return the bytes a column would use with pandas' default CSV dtypes.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return len(series)
+    if pd.api.types.is_numeric_dtype(series):
+        return len(series) * 8 # int64 or float64
+    return series.astype(DEFAULT_STRING_DTYPE).memory_usage(deep=True, index=False)
+
+def memory_footprint(df):
+    """
+    Return the bytes per column with default and with optimized dtypes.
+    """
+    rows = []
+    for name in df.columns:
+        series = df[name]
+        rows.append({"column": str(name),
+                     "dtype": str(series.dtype),
+                     "default_bytes": int(default_column_bytes(series)),
+                     "optimized_bytes": int(series.memory_usage(deep=True, index=False))})
+    return pd.DataFrame(rows, columns=["column", "dtype", "default_bytes", "optimized_bytes"])
+
+def format_footprint(footprint):
+    """
+    Format a memory footprint table with totals for the report.
+    """
+    default_total = int(footprint["default_bytes"].sum())
+    optimized_total = int(footprint["optimized_bytes"].sum())
+    saved = 1 - optimized_total / default_total if default_total else 0.0
+
+    text = footprint.to_string(index=False)
+    text += f"\n\nTotal: {default_total:,} bytes -> {optimized_total:,} bytes ({saved:.0%} saved)"
+    return text
@@ -0,0 +1,142 @@
+import os
+import pandas as pd
+import sidecar
+import dtypes
+
+REPORT_HEADER = "Dataset Summary Report"
+PREVIEW_ROWS = 5
+CHUNK_ROWS = 100_000
+
+class ReportCancelled(Exception):
+    """
+    Raised when report generation is cancelled between chunks.
+    """
+
+def is_csv_request(content):
+    """
+    Check if the content is a path to an existing CSV file.
+    """
+    return bool(content) and os.path.exists(content) and content.lower().endswith('.csv')
+
+def is_report(content):
+    """
+    Check if the content is a generated report.
+    """
+    return content.startswith(REPORT_HEADER)
+
+def read_csv_chunked(csv_path,
+                     progress=None,
+                     cancel_event=None,
+                     chunksize=CHUNK_ROWS,
+                     optimize=True,
+                     usecols=None):
+    """
+    Read a CSV file in chunks, reporting progress and checking for cancellation.
+
+    This function:
+    - infers explicit dtypes from a sample if optimize is set
+    - parses the file chunksize rows at a time with those dtypes and usecols
+    - down-casts the numeric columns once all chunks are read if optimize is set
+    - turns categoricals that are high-cardinality over the whole file back into strings
+    - calls progress with the fraction of bytes read after each chunk
+    - raises ReportCancelled as soon as cancel_event is set
+    """
+    dtype = dtypes.infer_dtypes(csv_path, usecols) if optimize else None
+    total_bytes = os.path.getsize(csv_path) or 1
+    chunks = []
+    with open(csv_path, "rb") as f:
+        for chunk in pd.read_csv(f, chunksize=chunksize, dtype=dtype, usecols=usecols):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ReportCancelled(csv_path)
+            chunks.append(chunk)
+            if progress:
+                progress(min(f.tell() / total_bytes, 1.0))
+
+    if not chunks: # header only
+        return pd.read_csv(csv_path, dtype=dtype, usecols=usecols)
+    # chunks down-cast on their own can get dtypes that pd.concat only
+    # reconciles through float64, so the target dtype comes from the whole column
+    df = dtypes.concat_chunks(chunks)
+    if not optimize:
+        return df
+    return dtypes.downcast_numerics(dtypes.drop_high_cardinality(df))
+
+def load_dataset(csv_path,
+                 use_sidecar=True,
+                 progress=None,
+                 cancel_event=None,
+                 optimize=True,
+                 usecols=None,
+                 nrows=None):
+    """
+    Read a CSV file into a DataFrame, through its columnar sidecar if enabled.
+
+    This function:
+    - reads from the sidecar if it matches the current CSV, mapping only nrows rows if given
+    - reads only nrows rows straight from the CSV if the sidecar is disabled
+    - otherwise parses the CSV in chunks
+    - converts the parsed CSV into a new sidecar if enabled and all columns were read
+    """
+    if use_sidecar and sidecar.is_fresh(csv_path):
+        try:
+            df = sidecar.read(csv_path, nrows)
+            if usecols is not None:
+                df = df[list(usecols)]
+            if progress:
+                progress(1.0)
+            return df
+        except Exception as e:
+            print(f"error reading sidecar, re-parsing CSV: {e}")
+
+    if nrows is not None and not use_sidecar:
+        df = pd.read_csv(csv_path, nrows=nrows, usecols=usecols)
+        if progress:
+            progress(1.0)
+        return df
+
+    # fingerprint the source before parsing, a change during the parse must invalidate the sidecar
+    fingerprint = sidecar.source_fingerprint(csv_path)
+    df = read_csv_chunked(csv_path, progress, cancel_event, optimize=optimize, usecols=usecols)
+    if use_sidecar and usecols is None:
+        try:
+            df = sidecar.write(csv_path, df, fingerprint)
+        except Exception as e:
+            print(f"error writing sidecar: {e}")
+    return df if nrows is None else df.head(nrows)
+
+def build_report(df, csv_path, footprint=None):
+    """
+    Build the summary report text for a loaded dataset.
+
+    The report includes:
+    - file information
+    - data preview
+    - memory footprint per column, if given
+    """
+    report = f"{REPORT_HEADER}\n{'='*50}\n\n"
+    report += f"File: {os.path.basename(csv_path)}\n"
+    report += f"\nData Preview (first {PREVIEW_ROWS} rows):\n{df.head(PREVIEW_ROWS).to_string()}"
+    if footprint is not None:
+        report += f"\n\nMemory Footprint (default vs optimized dtypes):\n{dtypes.format_footprint(footprint)}"
+    return report
+
+def generate_report(csv_path,
+                    use_sidecar=True,
+                    progress=None,
+                    cancel_event=None,
+                    optimize=True,
+                    usecols=None):
+    """
+    Generate the summary report for a CSV file without any GUI.
+    """
+    footprint = None
+    if optimize and use_sidecar and sidecar.is_fresh(csv_path):
+        footprint = sidecar.read_footprint(csv_path, usecols)
+
+    # the report shows only the preview rows, so the full dataset is needed
+    # only when its footprint still has to be measured
+    nrows = PREVIEW_ROWS if footprint is not None or not optimize else None
+    df = load_dataset(csv_path, use_sidecar, progress, cancel_event, optimize, usecols, nrows)
+    if optimize and footprint is None:
+        footprint = dtypes.memory_footprint(df)
+    return build_report(df, csv_path, footprint)
@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import socket
+import threading
+from collections import deque
+
+SOCKET_PATH = "report.sock"
+REPLAY_SIZE = 20
+PREVIEW_LINES = 15
+SEND_TIMEOUT = 1.0
+
+def make_message(request_id, status, csv_path, report=None, report_path=None, error=None):
+    """
+    Build the compact result message sent to subscribers.
+
+    Only the first lines of the report are included, subscribers that need
+    the rest read it from report_path.
+    """
+    message = {"id": request_id,
+               "status": status,
+               "file": csv_path,
+               "time": time.time()}
+    if report is not None:
+        lines = report.split("\n", PREVIEW_LINES)
+        message["preview"] = "\n".join(lines[:PREVIEW_LINES])
+        message["truncated"] = len(lines) > PREVIEW_LINES
+    if report_path is not None:
+        message["report_path"] = os.path.abspath(report_path)
+    if error is not None:
+        message["error"] = error
+    return message
+
+def is_supported():
+    """
+    Check if this platform supports Unix-domain sockets.
+    """
+    return hasattr(socket, "AF_UNIX")
+
+def is_listening(socket_path=SOCKET_PATH):
+    """
+    Check if a publisher is accepting connections on the socket.
+
+    The socket file alone proves nothing, a crashed publisher leaves it behind.
+    """
+    if not os.path.exists(socket_path):
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+class ResultPublisher:
+    """
+    Publishes result messages to any number of subscribers over a Unix-domain socket.
+
+    Messages are newline-delimited JSON. The last replay_size messages are
+    kept and sent to every new subscriber before live messages.
+    """
+
+    def __init__(self, socket_path=SOCKET_PATH, replay_size=REPLAY_SIZE):
+        self.socket_path = socket_path
+        self.replay = deque(maxlen=replay_size)
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.server = None
+
+    def start(self):
+        """
+        Bind the socket and start accepting subscribers.
+
+        A socket file left behind by a dead publisher is removed, but an
+        OSError is raised if another publisher is still listening on it.
+        """
+        if is_listening(self.socket_path):
+            raise OSError(f"another publisher is already listening on {self.socket_path}")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path) # stale socket
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        self.server.listen()
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+
+    def accept_loop(self):
+        """
+        Accept new subscribers and replay recent messages to them.
+        """
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return # server socket closed
+            conn.settimeout(SEND_TIMEOUT)
+            with self.lock:
+                try:
+                    for line in self.replay:
+                        conn.sendall(line)
+                except OSError:
+                    conn.close()
+                    continue
+                self.subscribers.append(conn)
+
+    def publish(self, message):
+        """
+        Send a message to all subscribers, dropping any that are gone or too slow.
+        """
+        line = (json.dumps(message) + "\n").encode("utf-8")
+        with self.lock:
+            self.replay.append(line)
+            alive = []
+            for conn in self.subscribers:
+                try:
+                    conn.sendall(line)
+                    alive.append(conn)
+                except OSError:
+                    conn.close()
+            self.subscribers = alive
+
+    def stop(self):
+        """
+        Close all connections and remove the socket file.
+        """
+        with self.lock:
+            for conn in self.subscribers:
+                conn.close()
+            self.subscribers = []
+        if self.server:
+            self.server.close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+def publish_results(publisher, results):
+    """
+    Forward result messages from a queue to the publisher until None arrives.
+
+    Lets producers hand results off without waiting for slow subscribers.
+    """
+    while True:
+        message = results.get()
+        if message is None:
+            return
+        publisher.publish(message)
+
+def subscribe(socket_path=SOCKET_PATH):
+    """
+    Connect to a publisher and yield result messages as they arrive.
+
+    Raises OSError if no publisher is listening.
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.connect(socket_path)
+    with conn, conn.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
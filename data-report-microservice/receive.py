@@ -1,36 +1,27 @@
 import time
 import os
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+import sys
+from collections import deque
+import watch
+import pubsub
 
-class ReportFileHandler(FileSystemEventHandler):
+class ReportFileHandler:
     """
-    File system event handler for monitoring changes to report.txt.
+    Handler for changes to report.txt.
     """
     
     def __init__(self):
         self.last_content = ""
     
-    def on_modified(self, event):
+    def process_report_content(self, content):
         """
-        Handle file modification events.
-        """
-        if event.src_path.endswith("report.txt"):
-            self.process_report_file()
-    
-    def process_report_file(self):
-        """
-        Process the report.txt file when modifications are detected.
+        Process the content of report.txt when modifications are detected.
         
         This function:
-        - reads the current content of report.txt
         - checks if the content has changed and is valid
         - detects CSV file imports and report generation
         """
         try:
-            with open("report.txt", "r") as f:
-                content = f.read().strip()
-            
             # only process if content changed and is not empty
             if content and content != self.last_content:
                 self.last_content = content
@@ -44,10 +35,10 @@ class ReportFileHandler(FileSystemEventHandler):
                 elif content.startswith("Dataset Summary Report"):
                     print("report generated and saved to report.txt\n")
                     # extract first few lines for preview
-                    lines = content.split('\n')[:15]
-                    for line in lines:
+                    lines = content.split('\n', pubsub.PREVIEW_LINES)
+                    for line in lines[:pubsub.PREVIEW_LINES]:
                         print(line)
-                    if len(content.split('\n')) > 15:
+                    if len(lines) > pubsub.PREVIEW_LINES:
                         print("... (full report saved in report.txt)")
                     print("=" * 60)
         
@@ -59,28 +50,77 @@ def monitor_report_file():
     Monitor the report.txt file for changes.
     
     This function:
-    - sets up a file system observer
-    - starts monitoring the current directory for changes
+    - sets up a debounced watcher on report.txt
     - processes existing content on startup
     - runs continuously until interrupted
     """
     event_handler = ReportFileHandler()
-    observer = Observer()
-    observer.schedule(event_handler, path=".", recursive=False)
-    observer.start()
+    watcher = watch.WatchedFile("report.txt", event_handler.process_report_content)
+    watcher.start()
     
     print("monitoring report.txt for file path/report...")
     
     try:
         # process existing file on startup
-        event_handler.process_report_file()
+        watcher.check()
         
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
-        observer.stop()
+        pass
     
-    observer.join()
+    watcher.stop()
+
+def print_result_message(message):
+    """
+    Print a result message pushed by the report engine.
+    """
+    if message["status"] == "done":
+        print(f"report generated for {message['file']} (request {message['id']})\n")
+        print(message["preview"])
+        if message.get("truncated"):
+            # the publisher leaves report_path out when it could not save the report
+            if message.get("report_path"):
+                print(f"... (full report saved in {message['report_path']})")
+            else:
+                print("... (report truncated, the full report was not saved)")
+        print("=" * 60)
+    else:
+        print(f"report {message['status']} for {message['file']}: {message.get('error', '')}")
+
+def receive_pushed_reports(socket_path=pubsub.SOCKET_PATH):
+    """
+    Receive reports pushed by the report engine.
+    
+    This function:
+    - subscribes to the result feed on the Unix-domain socket
+    - prints the preview of each new result without reading report files
+    - skips results already seen when the feed is replayed after a reconnect
+    - reconnects until interrupted if the publisher goes away
+    """
+    seen = deque(maxlen=pubsub.REPLAY_SIZE)
+    print(f"subscribed to report results on {socket_path}...")
+    
+    try:
+        while True:
+            try:
+                for message in pubsub.subscribe(socket_path):
+                    if message["id"] in seen:
+                        continue
+                    seen.append(message["id"])
+                    print_result_message(message)
+                print("report publisher closed the connection, reconnecting...")
+            except OSError:
+                pass
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
-    monitor_report_file()
\ No newline at end of file
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else pubsub.SOCKET_PATH
+    
+    # prefer pushed results, fall back to watching report.txt
+    if pubsub.is_supported() and pubsub.is_listening(socket_path):
+        receive_pushed_reports(socket_path)
+    else:
+        monitor_report_file()
\ No newline at end of file
@@ -1,51 +1,41 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
-import pandas as pd
-import os
+from tkinter import filedialog, messagebox, scrolledtext, ttk
 import time
+import queue
 import threading
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+import engine
+import watch
+import spool
+import pubsub
 
-class ReportFileHandler(FileSystemEventHandler):
+class ReportFileHandler:
     """
-    File system event handler for monitoring changes to report.txt.
+    Handler for changes to report.txt.
     """
     
     def __init__(self, gui_app):
         self.gui_app = gui_app
         self.last_content = ""
     
-    def on_modified(self, event):
+    def process_report_content(self, content):
         """
-        Handles file modification events.
-        """
-        if event.src_path.endswith("report.txt"):
-            self.process_report_file()
-    
-    def process_report_file(self):
-        """
-        Process the report.txt file when modifications are detected.
+        Process the content of report.txt when modifications are detected.
         
         This method:
-        - reads the current content of report.txt
         - checks if the content has changed and is a valid file path
         """
         try:
-            with open("report.txt", "r") as f:
-                content = f.read().strip()
-            
             # only process if content changed and is not empty
             if content and content != self.last_content:
                 self.last_content = content
                 
                 # check if it's a CSV file path
-                if os.path.exists(content) and content.lower().endswith('.csv'):
+                if engine.is_csv_request(content):
                     print(f"CSV file path detected: {content}")
                     # update GUI in a thread-safe way
                     self.gui_app.root.after(0, lambda: self.gui_app.process_manual_file(content))
                     
-            elif not content.startswith("Dataset Summary Report"):
+            elif not engine.is_report(content):
                 print("invalid CSV file path detected")
         
         except Exception as e:
@@ -56,7 +46,7 @@ class ReportGenerator:
     A GUI application for generating summary reports from CSV files.
     """
     
-    def __init__(self, root):
+    def __init__(self, root, use_sidecar=True, socket_path=pubsub.SOCKET_PATH):
         self.root = root
         self.root.title("CSV Report Generator")
         self.root.geometry("600x500")
@@ -64,9 +54,20 @@ class ReportGenerator:
         self.csv_file_path = None
         self.report_content = ""
         self.file_monitor = None
+        self.file_handler = None
+        self.publisher = None
+        self.publish_queue = None
+        self.forwarder = None
+        self.use_sidecar = use_sidecar
+        
+        # background report worker state
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.pending_file_path = None
         
         self.create_widgets()
         self.start_file_monitoring()
+        self.start_publisher(socket_path)
     
     def create_widgets(self):
         """
@@ -75,7 +76,8 @@ class ReportGenerator:
         This function sets up:
         - title label
         - file selection area with import button
-        - action buttons (save)
+        - action buttons (save, cancel)
+        - progress bar and status label
         - text area for report display
         """
         # title label
@@ -113,6 +115,32 @@ class ReportGenerator:
         save_btn.pack(side="left",
                       padx=5)
         
+        self.cancel_btn = tk.Button(button_frame,
+                                    text="Cancel",
+                                    command=self.cancel_report,
+                                    state="disabled")
+        self.cancel_btn.pack(side="left",
+                             padx=5)
+        
+        # progress frame
+        progress_frame = tk.Frame(self.root)
+        progress_frame.pack(fill="x",
+                            padx=20)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame,
+                                            mode="determinate",
+                                            maximum=100)
+        self.progress_bar.pack(side="left",
+                               fill="x",
+                               expand=True)
+        
+        self.status_label = tk.Label(progress_frame,
+                                     text="Idle",
+                                     width=20,
+                                     anchor="w")
+        self.status_label.pack(side="right",
+                               padx=(10, 0))
+        
         # report display area
         self.report_text = scrolledtext.ScrolledText(self.root,
                                                      height=20,
@@ -126,26 +154,77 @@ class ReportGenerator:
         """
         Start monitoring report.txt for manual file path entries.
         """
-        event_handler = ReportFileHandler(self)
-        self.file_monitor = Observer()
-        self.file_monitor.schedule(event_handler, path=".", recursive=False)
+        self.file_handler = ReportFileHandler(self)
+        self.file_monitor = watch.WatchedFile("report.txt", self.file_handler.process_report_content)
         self.file_monitor.start()
         
         # check for existing content on startup
         threading.Thread(target=self.check_existing_file, daemon=True).start()
     
+    def start_publisher(self, socket_path):
+        """
+        Start pushing finished reports to subscribers such as receive.py.
+        """
+        if not socket_path or not pubsub.is_supported():
+            return
+        try:
+            self.publisher = pubsub.ResultPublisher(socket_path)
+            self.publisher.start()
+            # subscribers are served from a separate thread so a slow one
+            # cannot freeze the GUI
+            self.publish_queue = queue.Queue()
+            self.forwarder = threading.Thread(target=pubsub.publish_results,
+                                              args=(self.publisher, self.publish_queue),
+                                              daemon=True)
+            self.forwarder.start()
+        except OSError as e:
+            print(f"error starting result publisher: {e}")
+            self.publisher = None
+    
+    def publish_result(self, file_path, status, report=None, error=None):
+        """
+        Push the outcome of the report for file_path to subscribers.
+        """
+        if not self.publisher:
+            return
+        request_id = spool.new_request_id()
+        report_path = None
+        if report:
+            # report.txt is overwritten by the next run, so point subscribers
+            # at a per-result file like the daemon does
+            try:
+                spool.ensure_spool()
+                report_path = spool.result_path(request_id)
+                spool.write_atomic(spool.SPOOL_DIR, report_path, report)
+            except OSError as e:
+                print(f"error writing result file: {e}")
+                report_path = None
+        message = pubsub.make_message(request_id,
+                                      status,
+                                      file_path,
+                                      report=report,
+                                      report_path=report_path,
+                                      error=error)
+        self.publish_queue.put(message)
+    
+    def write_report_file(self, content):
+        """
+        Write report.txt and treat its new content as already processed.
+        
+        The watcher skips our own writes, so the handler would otherwise keep
+        comparing against the previous content and drop a client writing the
+        same CSV path again.
+        """
+        self.file_monitor.write(content)
+        self.file_handler.last_content = content.strip()
+    
     def check_existing_file(self):
         """
         Check if report.txt already contains a valid file path on startup.
         """
         time.sleep(1) # wait a bit for GUI to initialize
         try:
-            if os.path.exists("report.txt"):
-                with open("report.txt", "r") as f:
-                    content = f.read().strip()
-                
-                if os.path.exists(content) and content.lower().endswith('.csv'):
-                    self.root.after(0, lambda: self.process_manual_file(content))
+            self.file_monitor.check()
         except:
             pass
     
@@ -153,10 +232,7 @@ class ReportGenerator:
         """
         Process a manually entered file path from report.txt.
         """
-        self.csv_file_path = file_path
-        self.file_label.config(text=file_path)
-        self.generate_report()
-        messagebox.showinfo("Success", "CSV file imported and report generated!")
+        self.request_report(file_path)
     
     def import_csv(self):
         """
@@ -173,54 +249,147 @@ class ReportGenerator:
         )
         
         if file_path:
-            self.csv_file_path = file_path
-            self.file_label.config(text=file_path)
-            
-            # write file path to report.txt
-            with open("report.txt", "w") as f:
-                f.write(file_path)
+            # write file path to report.txt (our own write, so the watcher skips it)
+            self.write_report_file(file_path)
             
             # automatically generate and display the report
-            self.generate_report()
-            
-            messagebox.showinfo("Success", "CSV file imported and report generated!")
+            self.request_report(file_path)
+    
+    def request_report(self, file_path):
+        """
+        Generate a report for a CSV file in the background.
+        
+        If a report is already running, the request is kept as the single
+        pending request, replacing any older one, and starts once the
+        current run ends.
+        """
+        # the worker thread exits before its result is handled on this
+        # thread, so a run only ends once end_run has cleared self.worker
+        if self.worker is not None:
+            self.pending_file_path = file_path
+            self.status_label.config(text="Queued next file")
+            return
+        
+        self.csv_file_path = file_path
+        self.file_label.config(text=file_path)
+        self.generate_report()
     
     def generate_report(self):
         """
-        Generate a summary report from the imported CSV file.
+        Start generating a summary report from the imported CSV file.
         
         This function:
         - checks if a CSV file has been imported
-        - reads the CSV file using pandas
-        - creates a comprehensive summary including:
-          * file information
-          * data preview
-        - displays the report in the text area
-        - updates report.txt with the full report content
+        - resets the progress bar and enables the cancel button
+        - starts a worker thread that builds the summary with the headless report engine
         """
         if not self.csv_file_path:
             return
         
+        self.cancel_event = threading.Event()
+        self.progress_bar["value"] = 0
+        self.status_label.config(text="Reading CSV...")
+        self.cancel_btn.config(state="normal")
+        
+        self.worker = threading.Thread(target=self.run_report,
+                                       args=(self.csv_file_path, self.cancel_event),
+                                       daemon=True)
+        self.worker.start()
+    
+    def run_report(self, file_path, cancel_event):
+        """
+        Build the report on the worker thread and hand the result to the GUI thread.
+        """
+        def progress(fraction):
+            self.root.after(0, lambda: self.update_progress(fraction))
+        
+        try:
+            report = engine.generate_report(file_path,
+                                            self.use_sidecar,
+                                            progress=progress,
+                                            cancel_event=cancel_event)
+            self.root.after(0, lambda: self.report_finished(file_path, report))
+        except engine.ReportCancelled:
+            self.root.after(0, lambda: self.report_cancelled(file_path))
+        except Exception as e:
+            self.root.after(0, lambda e=e: self.report_failed(file_path, e))
+    
+    def update_progress(self, fraction):
+        """
+        Show the fraction of the CSV file read so far.
+        """
+        self.progress_bar["value"] = fraction * 100
+        self.status_label.config(text=f"Reading CSV... {fraction:.0%}")
+    
+    def report_finished(self, file_path, report):
+        """
+        Display a finished report.
+        
+        This function:
+        - displays the report in the text area
+        - updates report.txt with the full report content
+        - pushes the result to subscribers
+        - starts the pending request, if any
+        """
+        self.report_content = report
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(1.0, self.report_content)
+        
         try:
-            # read CSV file
-            df = pd.read_csv(self.csv_file_path)
-            
-            # generate summary report
-            self.report_content = f"Dataset Summary Report\n{'='*50}\n\n"
-            self.report_content += f"File: {os.path.basename(self.csv_file_path)}\n"
-            
-            self.report_content += f"\nData Preview (first 5 rows):\n{df.head().to_string()}"
-            
-            # display report
-            self.report_text.delete(1.0, tk.END)
-            self.report_text.insert(1.0, self.report_content)
-            
             # update report.txt with the full report content
-            with open("report.txt", "w") as f:
-                f.write(self.report_content)
-            
+            self.write_report_file(self.report_content)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+            print(f"error writing report file: {e}")
+        
+        self.publish_result(file_path, "done", report=report)
+        self.end_run("Report generated")
+        if not self.start_pending():
+            messagebox.showinfo("Success", "CSV file imported and report generated!")
+    
+    def report_cancelled(self, file_path):
+        """
+        Reset the window after a cancelled report.
+        """
+        self.progress_bar["value"] = 0
+        self.publish_result(file_path, "cancelled")
+        self.end_run("Cancelled")
+        self.start_pending()
+    
+    def report_failed(self, file_path, error):
+        """
+        Show the error of a failed report.
+        """
+        self.progress_bar["value"] = 0
+        self.publish_result(file_path, "failed", error=str(error))
+        self.end_run("Failed")
+        if not self.start_pending():
+            messagebox.showerror("Error", f"Failed to generate report: {str(error)}")
+    
+    def end_run(self, status):
+        """
+        Reset the progress widgets once the worker has stopped.
+        """
+        self.worker = None
+        self.cancel_btn.config(state="disabled")
+        self.status_label.config(text=status)
+    
+    def start_pending(self):
+        """
+        Start the pending request, if any, and return whether one was started.
+        """
+        file_path, self.pending_file_path = self.pending_file_path, None
+        if file_path is None:
+            return False
+        self.request_report(file_path)
+        return True
+    
+    def cancel_report(self):
+        """
+        Cancel the running report and drop the pending request.
+        """
+        self.pending_file_path = None
+        self.cancel_event.set()
+        self.status_label.config(text="Cancelling...")
     
     def save_report(self):
         """
@@ -255,9 +424,13 @@ class ReportGenerator:
         """
         Clean up when the application closes.
         """
+        self.cancel_report()
         if self.file_monitor:
             self.file_monitor.stop()
-            self.file_monitor.join()
+        if self.publisher:
+            self.publish_queue.put(None)
+            self.forwarder.join()
+            self.publisher.stop()
         self.root.destroy()
 
 if __name__ == "__main__":
@@ -0,0 +1,245 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+import dtypes
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError: # pyarrow is optional, fall back to the .npy layout
+    pa = None
+    feather = None
+
+SIDECAR_DIR = ".sidecar"
+MANIFEST_FILE = "manifest.json"
+FEATHER_FILE = "data.feather"
+FORMAT_VERSION = 2
+
+def sidecar_path(csv_path, cache_dir=SIDECAR_DIR):
+    """
+    Return the directory holding the columnar sidecar for a CSV file.
+    """
+    abs_path = os.path.abspath(csv_path)
+    key = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(abs_path)}.{key}")
+
+def source_fingerprint(csv_path):
+    """
+    Return the size and modification time used to detect changes to the CSV.
+    """
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def read_manifest(path):
+    """
+    Read the manifest of a sidecar directory, or None if it is missing or broken.
+    """
+    try:
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_fresh(csv_path, cache_dir=SIDECAR_DIR):
+    """
+    Check if a sidecar exists and was built from the current CSV contents.
+    """
+    manifest = read_manifest(sidecar_path(csv_path, cache_dir))
+    if not manifest or manifest.get("version") != FORMAT_VERSION:
+        return False
+    try:
+        return manifest.get("source") == source_fingerprint(csv_path)
+    except OSError:
+        return False
+
+def write_feather(df, path):
+    """
+    Write the DataFrame as a single uncompressed Feather file.
+    """
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    feather.write_feather(table, os.path.join(path, FEATHER_FILE), compression="uncompressed")
+    return {"layout": "feather", "columns": [str(name) for name in df.columns]}
+
+def encode_strings(series):
+    """
+    Encode a string column as a UTF-8 byte buffer and an offsets array.
+
+    Value i is data[offsets[i]:offsets[i + 1]]; nulls are stored as empty strings.
+    """
+    encoded = [("" if pd.isna(value) else str(value)).encode("utf-8") for value in series]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return data, offsets
+
+def decode_strings(data, offsets, mask):
+    """
+    Decode the strings between consecutive offsets, with nulls where the mask is set.
+    """
+    start = int(offsets[0]) if len(offsets) else 0
+    buffer = data[start:int(offsets[-1]) if len(offsets) else 0].tobytes()
+    bounds = (offsets - start).tolist()
+    strings = np.empty(len(bounds) - 1 if bounds else 0, dtype=object)
+    for i in range(len(strings)):
+        strings[i] = np.nan if mask[i] else buffer[bounds[i]:bounds[i + 1]].decode("utf-8")
+    return strings
+
+def write_npy(df, path):
+    """
+    Write every column of the DataFrame as its own .npy file.
+
+    Categoricals are stored as an integer code array plus their categories,
+    other strings as one UTF-8 buffer plus an offsets array and a null mask,
+    so a single long value does not pad every row.
+    """
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        entry = {"name": str(name), "file": f"col{i}.npy"}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry["kind"] = "category"
+            entry["categories"] = [str(value) for value in series.cat.categories]
+            np.save(os.path.join(path, entry["file"]), series.cat.codes.to_numpy())
+        elif series.dtype == object or pd.api.types.is_string_dtype(series):
+            entry["kind"] = "string"
+            entry["offsets"] = f"col{i}.offsets.npy"
+            entry["mask"] = f"col{i}.mask.npy"
+            data, offsets = encode_strings(series)
+            np.save(os.path.join(path, entry["file"]), data)
+            np.save(os.path.join(path, entry["offsets"]), offsets)
+            np.save(os.path.join(path, entry["mask"]), series.isna().to_numpy())
+        else:
+            entry["kind"] = "numeric"
+            np.save(os.path.join(path, entry["file"]), series.to_numpy())
+        columns.append(entry)
+    return {"layout": "npy", "columns": columns}
+
+def write(csv_path, df, fingerprint, cache_dir=SIDECAR_DIR):
+    """
+    Convert a parsed CSV into a columnar sidecar.
+
+    The fingerprint must be taken with source_fingerprint before the CSV was
+    parsed, so a file that changes during the parse is never stamped as fresh.
+
+    This function:
+    - down-casts the DataFrame to compact dtypes
+    - writes it to a temporary directory as Feather (pyarrow) or .npy files
+    - records the source fingerprint in the manifest
+    - swaps the temporary directory into place
+    """
+    path = sidecar_path(csv_path, cache_dir)
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+
+    try:
+        compact = dtypes.downcast_frame(df)
+        if pa is not None:
+            manifest = write_feather(compact, temp_path)
+        else:
+            manifest = write_npy(compact, temp_path)
+
+        manifest["version"] = FORMAT_VERSION
+        manifest["source"] = fingerprint
+        manifest["source_path"] = os.path.abspath(csv_path)
+        manifest["rows"] = len(compact)
+        # lets reports show the footprint without loading every row
+        manifest["footprint"] = dtypes.memory_footprint(compact).to_dict("records")
+        with open(os.path.join(temp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(temp_path, path)
+    except BaseException: # also clean up when a batch timeout interrupts the write
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+    return compact
+
+def read_feather(path, manifest, nrows=None):
+    """
+    Memory-map the Feather file and convert it to a DataFrame.
+    """
+    table = feather.read_table(os.path.join(path, FEATHER_FILE), memory_map=True)
+    if nrows is not None:
+        table = table.slice(0, nrows)
+    return table.to_pandas(split_blocks=True)
+
+def read_npy(path, manifest, nrows=None):
+    """
+    Memory-map the per-column .npy files and assemble a DataFrame.
+
+    Numeric columns stay views on the mapped files; only the rows asked
+    for are touched.
+    """
+    columns = {}
+    for entry in manifest["columns"]:
+        values = np.load(os.path.join(path, entry["file"]), mmap_mode="r")
+
+        if entry["kind"] == "string":
+            # values is the whole UTF-8 buffer, the offsets pick out the rows
+            offsets = np.load(os.path.join(path, entry["offsets"]), mmap_mode="r")
+            mask = np.load(os.path.join(path, entry["mask"]), mmap_mode="r")
+            if nrows is not None:
+                offsets = offsets[:nrows + 1]
+                mask = mask[:nrows]
+            columns[entry["name"]] = decode_strings(values, offsets, mask)
+            continue
+
+        if nrows is not None:
+            values = values[:nrows]
+        if entry["kind"] == "category":
+            columns[entry["name"]] = pd.Categorical.from_codes(values, categories=entry["categories"])
+        else:
+            columns[entry["name"]] = values
+    return pd.DataFrame(columns, copy=False)
+
+def read(csv_path, nrows=None, cache_dir=SIDECAR_DIR):
+    """
+    Read a DataFrame from an existing sidecar.
+    """
+    path = sidecar_path(csv_path, cache_dir)
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"no sidecar for {csv_path}")
+
+    if manifest["layout"] == "feather":
+        if feather is None:
+            raise RuntimeError("sidecar was written with pyarrow, which is not installed")
+        return read_feather(path, manifest, nrows)
+    return read_npy(path, manifest, nrows)
+
+def read_footprint(csv_path, usecols=None, cache_dir=SIDECAR_DIR):
+    """
+    Return the memory footprint recorded when the sidecar was written, or None.
+    """
+    manifest = read_manifest(sidecar_path(csv_path, cache_dir))
+    if not manifest or "footprint" not in manifest:
+        return None
+    footprint = pd.DataFrame(manifest["footprint"])
+    if usecols is not None:
+        footprint = footprint[footprint["column"].isin([str(name) for name in usecols])]
+    return footprint.reset_index(drop=True)
+
+def main():
+    """
+    Convert the CSV files given on the command line into sidecars.
+    """
+    if len(sys.argv) < 2:
+        print("usage: python sidecar.py file.csv [file.csv ...]")
+        sys.exit(1)
+
+    for csv_path in sys.argv[1:]:
+        if is_fresh(csv_path):
+            print(f"sidecar up to date: {csv_path}")
+            continue
+        fingerprint = source_fingerprint(csv_path)
+        df = write(csv_path, pd.read_csv(csv_path), fingerprint)
+        print(f"sidecar written for {csv_path}: {len(df)} rows -> {sidecar_path(csv_path)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+
+SPOOL_DIR = "spool"
+STATUSES = ("queued", "running", "done", "failed")
+RESULTS_DIR = "results"
+TEMP_DIR = "tmp"
+REQUEST_SUFFIX = ".req"
+
+def ensure_spool(spool_dir=SPOOL_DIR):
+    """
+    Create the spool directory layout if it does not exist yet.
+    """
+    for name in STATUSES + (RESULTS_DIR, TEMP_DIR):
+        os.makedirs(os.path.join(spool_dir, name), exist_ok=True)
+
+def new_request_id():
+    """
+    Return a unique request id that sorts in submission order.
+    """
+    return f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+
+def request_path(spool_dir, status, request_id):
+    """
+    Return the path of a request file in the given status directory.
+    """
+    return os.path.join(spool_dir, status, request_id + REQUEST_SUFFIX)
+
+def result_path(request_id, spool_dir=SPOOL_DIR):
+    """
+    Return the path of the result file for a request.
+    """
+    return os.path.join(spool_dir, RESULTS_DIR, request_id + ".txt")
+
+def write_atomic(spool_dir, path, content):
+    """
+    Write a file through the spool's temp directory and rename it into place.
+    """
+    temp_path = os.path.join(spool_dir, TEMP_DIR, f"{uuid.uuid4().hex}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+def submit(csv_path, spool_dir=SPOOL_DIR):
+    """
+    Queue a report request for a CSV file and return its request id.
+    """
+    ensure_spool(spool_dir)
+    request_id = new_request_id()
+    request = {"id": request_id,
+               "path": os.path.abspath(csv_path),
+               "submitted": time.time()}
+    write_atomic(spool_dir, request_path(spool_dir, "queued", request_id), json.dumps(request))
+    return request_id
+
+def claim(spool_dir=SPOOL_DIR):
+    """
+    Claim the oldest queued request, or return None if the queue is empty.
+
+    This function:
+    - lists the queued requests in submission order
+    - moves one into running/ with an atomic rename
+    - skips requests another worker claimed first
+    - moves requests that cannot be parsed to failed/ with an error result
+    """
+    queued_dir = os.path.join(spool_dir, "queued")
+    try:
+        names = sorted(os.listdir(queued_dir))
+    except FileNotFoundError:
+        return None
+
+    for name in names:
+        if not name.endswith(REQUEST_SUFFIX):
+            continue
+        request_id = name[:-len(REQUEST_SUFFIX)]
+        running = request_path(spool_dir, "running", request_id)
+        try:
+            os.rename(os.path.join(queued_dir, name), running)
+        except FileNotFoundError:
+            continue # claimed by another worker
+
+        try:
+            with open(running, "r", encoding="utf-8") as f:
+                request = json.load(f)
+            if not isinstance(request, dict) or "path" not in request:
+                raise ValueError("no CSV path")
+        except (OSError, ValueError) as e:
+            fail(request_id, f"malformed request: {e}", spool_dir)
+            continue
+
+        # the file name is what the other spool functions rename
+        request["id"] = request_id
+        return request
+    return None
+
+def finish(request_id, content, status, spool_dir=SPOOL_DIR):
+    """
+    Store the result of a running request and mark it done or failed.
+    """
+    write_atomic(spool_dir, result_path(request_id, spool_dir), content)
+    os.rename(request_path(spool_dir, "running", request_id),
+              request_path(spool_dir, status, request_id))
+
+def complete(request_id, report, spool_dir=SPOOL_DIR):
+    """
+    Mark a running request as done with its report.
+    """
+    finish(request_id, report, "done", spool_dir)
+
+def fail(request_id, error, spool_dir=SPOOL_DIR):
+    """
+    Mark a running request as failed with its error message.
+    """
+    finish(request_id, error, "failed", spool_dir)
+
+def status(request_id, spool_dir=SPOOL_DIR):
+    """
+    Return the status of a request, or None if it is unknown.
+    """
+    # check later states first and look twice, so a request being renamed
+    # into the next directory is not reported as missing
+    for _ in range(2):
+        for state in reversed(STATUSES):
+            if os.path.exists(request_path(spool_dir, state, request_id)):
+                return state
+    return None
+
+def read_result(request_id, spool_dir=SPOOL_DIR):
+    """
+    Read the report (or error message) of a finished request.
+    """
+    with open(result_path(request_id, spool_dir), "r", encoding="utf-8") as f:
+        return f.read()
+
+def wait(request_id, timeout=None, poll_interval=0.1, spool_dir=SPOOL_DIR):
+    """
+    Wait for a request to finish and return its status and result.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        state = status(request_id, spool_dir)
+        if state in ("done", "failed"):
+            return state, read_result(request_id, spool_dir)
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"request {request_id} still {state}")
+        time.sleep(poll_interval)
+
+def requeue_running(spool_dir=SPOOL_DIR):
+    """
+    Move requests left in running/ (e.g. by a crashed worker) back to the queue.
+    """
+    running_dir = os.path.join(spool_dir, "running")
+    count = 0
+    for name in os.listdir(running_dir):
+        if name.endswith(REQUEST_SUFFIX):
+            request_id = name[:-len(REQUEST_SUFFIX)]
+            try:
+                os.rename(os.path.join(running_dir, name),
+                          request_path(spool_dir, "queued", request_id))
+                count += 1
+            except FileNotFoundError:
+                pass
+    return count
+
+def main():
+    """
+    Submit CSV files to the spool from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Queue CSV report requests")
+    parser.add_argument("paths", nargs="+", help="CSV files to queue")
+    parser.add_argument("--spool-dir", default=SPOOL_DIR,
+                        help="spool directory (default: spool)")
+    parser.add_argument("--wait", action="store_true",
+                        help="wait for the reports and print them")
+    args = parser.parse_args()
+
+    request_ids = [submit(path, args.spool_dir) for path in args.paths]
+    for request_id, path in zip(request_ids, args.paths):
+        print(f"queued {path} as {request_id}")
+
+    if not args.wait:
+        return
+
+    failed = False
+    for request_id in request_ids:
+        state, result = wait(request_id, spool_dir=args.spool_dir)
+        print(f"\n[{state}] {request_id}\n{result}")
+        failed = failed or state != "done"
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import watch
+
+SETTLE_SECONDS = 0.5
+
+def start_watcher(path):
+    received = []
+    watcher = watch.WatchedFile(str(path), received.append, debounce=0.05)
+    watcher.start()
+    return watcher, received
+
+def test_reads_stay_flat_while_idle(tmp_path):
+    path = tmp_path / "report.txt"
+    watcher, received = start_watcher(path)
+    try:
+        path.write_text("data.csv")
+        time.sleep(SETTLE_SECONDS)
+        reads = watcher.stats["reads"]
+        assert received == ["data.csv"]
+
+        time.sleep(3 * SETTLE_SECONDS)
+        assert watcher.stats["reads"] == reads
+    finally:
+        watcher.stop()
+
+def test_self_write_is_not_read_back(tmp_path):
+    path = tmp_path / "report.txt"
+    watcher, received = start_watcher(path)
+    try:
+        watcher.write("Dataset Summary Report\n" + "x" * 100_000)
+        time.sleep(SETTLE_SECONDS)
+        assert watcher.stats["reads"] == 0
+        assert received == []
+    finally:
+        watcher.stop()
+
+def test_external_write_after_self_write_is_seen(tmp_path):
+    path = tmp_path / "report.txt"
+    watcher, received = start_watcher(path)
+    try:
+        watcher.write("report A")
+        time.sleep(SETTLE_SECONDS)
+        path.write_text("report B") # same length as our own write
+        time.sleep(SETTLE_SECONDS)
+        assert received == ["report B"]
+    finally:
+        watcher.stop()
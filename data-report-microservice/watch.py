@@ -0,0 +1,137 @@
+import os
+import hashlib
+import threading
+from watchdog.observers import Observer
+from watchdog.events import (FileSystemEventHandler, EVENT_TYPE_CREATED, EVENT_TYPE_DELETED,
+                             EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED)
+
+DEBOUNCE_SECONDS = 0.1
+
+# events that can change the content; opened/closed events are also emitted
+# by our own reads and would otherwise trigger another check after every read
+CHANGE_EVENTS = (EVENT_TYPE_CREATED, EVENT_TYPE_DELETED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED)
+
+def file_fingerprint(path):
+    """
+    Return a cheap (size, mtime, inode) fingerprint of a file, or None if it is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+def content_digest(content):
+    """
+    Return a hash of the file content, used to recognize our own writes.
+    """
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+class WatchedFile(FileSystemEventHandler):
+    """
+    Debounced, self-write-aware watcher for a single file.
+
+    Events for other files in the directory are dropped before any work is
+    done, and bursts of events are collapsed into one check after a short
+    quiet window. Our own writes are recognized by a hash of their content,
+    since a same-length write within the mtime granularity keeps the
+    fingerprint. The fingerprint lets a check skip the read when no event
+    arrived since the last check, or when the events are those of our own
+    last write.
+    """
+
+    def __init__(self, path, callback, debounce=DEBOUNCE_SECONDS):
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.debounce = debounce
+        self.lock = threading.Lock()
+        self.timer = None
+        self.observer = None
+        self.last_fingerprint = None
+        self.last_digest = None
+
+        # bumped for every event, so a check knows if anything happened since the last one
+        self.generation = 0
+        self.checked_generation = 0
+        # set by write until the next check, which can then trust the fingerprint
+        self.self_write_pending = False
+
+        # counters for checking how many events end up as reads
+        self.stats = {"events": 0, "checks": 0, "reads": 0, "self_writes": 0}
+
+    def dispatch(self, event):
+        """
+        Schedule a check for events that touch the watched file.
+        """
+        if event.is_directory or event.event_type not in CHANGE_EVENTS:
+            return
+        paths = (event.src_path, getattr(event, "dest_path", ""))
+        if self.path not in (os.path.abspath(p) for p in paths if p):
+            return
+
+        with self.lock:
+            self.stats["events"] += 1
+            self.generation += 1
+            if self.timer:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.debounce, self.check)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def check(self):
+        """
+        Read the file and pass its content to the callback if it changed.
+        """
+        with self.lock:
+            self.stats["checks"] += 1
+            fingerprint = file_fingerprint(self.path)
+            unchanged = (fingerprint == self.last_fingerprint
+                         and (self.generation == self.checked_generation or self.self_write_pending))
+            self.checked_generation = self.generation
+            self.self_write_pending = False
+            if fingerprint is None or unchanged:
+                return
+            try:
+                with open(self.path, "r") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                return
+            self.stats["reads"] += 1
+            self.last_fingerprint = fingerprint
+            digest = content_digest(content)
+            if digest == self.last_digest: # our own write, or rewritten unchanged
+                return
+            self.last_digest = digest
+
+        self.callback(content.strip())
+
+    def write(self, content):
+        """
+        Write the file and remember the result as our own write.
+        """
+        with self.lock:
+            with open(self.path, "w") as f:
+                f.write(content)
+            self.last_fingerprint = file_fingerprint(self.path)
+            self.last_digest = content_digest(content)
+            self.self_write_pending = True
+            self.stats["self_writes"] += 1
+
+    def start(self):
+        """
+        Start watching the directory that contains the file.
+        """
+        self.observer = Observer()
+        self.observer.schedule(self, path=os.path.dirname(self.path), recursive=False)
+        self.observer.start()
+
+    def stop(self):
+        """
+        Stop watching and cancel any pending check.
+        """
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
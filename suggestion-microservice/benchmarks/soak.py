@@ -0,0 +1,285 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import contextlib
+import multiprocessing
+from datetime import datetime
+
+try:
+    import resource
+except ImportError: # not available on Windows, peak RSS is used from psutil only
+    resource = None
+
+try:
+    import psutil
+except ImportError: # optional, /proc or getrusage is used instead
+    psutil = None
+
+# make the service modules importable when run from any directory
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from receive import SuggestionReceiver
+
+def current_rss_bytes():
+    """
+    Return the current resident set size of this process in bytes.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is not None:
+        # peak instead of current, still catches growth
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+def percentile(values, fraction):
+    """
+    Return the nearest-rank percentile of a list of numbers.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+def seed_database(database_file, size):
+    """
+    Write a data.json with the given number of existing suggestions.
+    """
+    now = datetime.now().isoformat()
+    with open(database_file, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(size):
+            entry = {"id": i + 1,
+                     "suggestion": f"seeded suggestion {i + 1}",
+                     "date_added": now,
+                     "status": "new",
+                     "has_attachment": False,
+                     "attachment_path": None,
+                     "submission_timestamp": now}
+            f.write(("," if i else "") + "\n  " + json.dumps(entry))
+        f.write("\n]")
+
+def produce(suggestion_file, producer_id, rate, stop_event):
+    """
+    Append suggestions to suggestion.txt at a fixed rate until stopped.
+    """
+    interval = 1.0 / rate
+    count = 0
+    next_time = time.monotonic()
+    while not stop_event.is_set():
+        suggestion_data = {
+            "suggestion": f"soak suggestion {producer_id}-{count}",
+            "timestamp": datetime.now().isoformat(),
+            "has_attachment": False,
+            "attachment_path": None
+        }
+        with open(suggestion_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(suggestion_data) + "\n")
+        count += 1
+
+        next_time += interval
+        stop_event.wait(max(0.0, next_time - time.monotonic()))
+
+def receive_pass(receiver, stats):
+    """
+    Run one pass of the receiver loop and record latency and CPU per suggestion.
+    """
+    new_suggestions = receiver.read_suggestions()
+    for suggestion in new_suggestions:
+        cpu_start = time.process_time()
+        result = receiver.add_to_database(suggestion)
+        stats["cpu_seconds"].append(time.process_time() - cpu_start)
+        if result is None:
+            stats["failed"] += 1
+            continue
+        submitted = datetime.fromisoformat(result["submission_timestamp"])
+        added = datetime.fromisoformat(result["date_added"])
+        stats["latencies"].append((added - submitted).total_seconds())
+    return len(new_suggestions)
+
+def run_soak(db_size, args):
+    """
+    Run one soak against a database seeded with db_size suggestions.
+
+    This function:
+    - seeds data.json in a scratch directory
+    - starts the producer processes
+    - runs the receiver loop in this process, sampling RSS after every pass
+    - drains what is left once the producers stop
+    """
+    work_dir = tempfile.mkdtemp(prefix="suggestion-soak-", dir=args.work_dir)
+    previous_dir = os.getcwd()
+    os.chdir(work_dir)
+
+    try:
+        seed_database("data.json", db_size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            receiver = SuggestionReceiver()
+
+        stats = {"latencies": [], "cpu_seconds": [], "failed": 0}
+        rss_start = current_rss_bytes()
+        rss_peak = rss_start
+
+        stop_event = multiprocessing.Event()
+        producers = [multiprocessing.Process(target=produce,
+                                             args=(receiver.suggestion_file, i, args.rate, stop_event),
+                                             daemon=True)
+                     for i in range(args.producers)]
+        for producer in producers:
+            producer.start()
+
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        last_display_time = 0
+        stopped = False
+        drain_deadline = start + args.duration + args.drain_timeout
+        processed = 0
+
+        # stop the producers on time even if a receiver pass runs long
+        stop_timer = threading.Timer(args.duration, stop_event.set)
+        stop_timer.start()
+
+        # receiver output is noise here, only the numbers matter
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            while True:
+                now = time.perf_counter()
+                if not stopped and stop_event.is_set():
+                    for producer in producers:
+                        producer.join()
+                    stopped = True
+
+                count = receive_pass(receiver, stats)
+                processed += count
+                output.seek(0)
+                output.truncate()
+
+                if args.display_interval and now - last_display_time >= args.display_interval:
+                    receiver.display_latest_additions()
+                    last_display_time = now
+
+                rss_peak = max(rss_peak, current_rss_bytes())
+                if stopped and (count == 0 or now >= drain_deadline):
+                    break
+                time.sleep(args.poll_interval)
+
+        elapsed = time.perf_counter() - start
+        cpu_total = time.process_time() - cpu_start
+        latencies = stats["latencies"]
+
+        return {"db_size": db_size,
+                "producers": args.producers,
+                "rate_per_producer": args.rate,
+                "duration_seconds": elapsed,
+                "processed": processed,
+                "failed": stats["failed"],
+                "ingest_rate": processed / elapsed if elapsed else 0.0,
+                "latency_seconds": {"p50": percentile(latencies, 0.50),
+                                    "p90": percentile(latencies, 0.90),
+                                    "p99": percentile(latencies, 0.99),
+                                    "max": max(latencies) if latencies else None},
+                "cpu_ms_per_suggestion": 1000 * cpu_total / processed if processed else None,
+                "add_cpu_ms_per_suggestion": (1000 * sum(stats["cpu_seconds"]) / len(stats["cpu_seconds"])
+                                              if stats["cpu_seconds"] else None),
+                "rss_start_bytes": rss_start,
+                "rss_peak_bytes": rss_peak,
+                "rss_growth_bytes": rss_peak - rss_start,
+                "database_bytes": os.path.getsize("data.json")}
+    finally:
+        os.chdir(previous_dir)
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+def check_budgets(result, args):
+    """
+    Return the budget violations of one soak run.
+    """
+    violations = []
+    p99 = result["latency_seconds"]["p99"]
+    if args.max_p99_latency is not None and p99 is not None and p99 > args.max_p99_latency:
+        violations.append(f"p99 latency {p99:.3f}s > {args.max_p99_latency}s")
+    growth_mb = result["rss_growth_bytes"] / (1024 * 1024)
+    if args.max_rss_growth is not None and growth_mb > args.max_rss_growth:
+        violations.append(f"RSS growth {growth_mb:.1f} MB > {args.max_rss_growth} MB")
+    if args.min_ingest_rate is not None and result["ingest_rate"] < args.min_ingest_rate:
+        violations.append(f"ingest rate {result['ingest_rate']:.1f}/s < {args.min_ingest_rate}/s")
+    if result["failed"]:
+        violations.append(f"{result['failed']} suggestion(s) failed to process")
+    return violations
+
+def main():
+    """
+    Parse command line arguments, run the soaks and check them against the budgets.
+    """
+    parser = argparse.ArgumentParser(description="Soak test the suggestion receiver")
+    parser.add_argument("--db-sizes", nargs="+", type=lambda v: int(float(v)), default=[0, 10**3, 10**4],
+                        help="database sizes to seed, e.g. 0 1e4 1e6 (default: 0 1e3 1e4)")
+    parser.add_argument("--producers", type=int, default=2,
+                        help="number of producer processes (default: 2)")
+    parser.add_argument("--rate", type=float, default=5.0,
+                        help="suggestions per second per producer (default: 5)")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="seconds the producers run for each database size (default: 30)")
+    parser.add_argument("--drain-timeout", type=float, default=60.0,
+                        help="seconds allowed to process the backlog after the producers stop (default: 60)")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="receiver sleep between passes, as in receive.py (default: 1)")
+    parser.add_argument("--display-interval", type=float, default=5.0,
+                        help="seconds between database displays, 0 to disable (default: 5)")
+    parser.add_argument("--max-p99-latency", type=float, default=None,
+                        help="fail if the p99 submission-to-database latency exceeds this many seconds")
+    parser.add_argument("--max-rss-growth", type=float, default=None,
+                        help="fail if receiver RSS grows by more than this many MB")
+    parser.add_argument("--min-ingest-rate", type=float, default=None,
+                        help="fail if fewer suggestions per second are ingested")
+    parser.add_argument("--work-dir", default=None,
+                        help="parent directory for the scratch data (default: system temp)")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the scratch data for inspection")
+    parser.add_argument("-o", "--output",
+                        help="file for the JSON results (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    failed = False
+    for db_size in args.db_sizes:
+        print(f"soaking with {db_size} existing suggestions...", file=sys.stderr)
+        result = run_soak(db_size, args)
+        result["violations"] = check_budgets(result, args)
+        results.append(result)
+
+        p99 = result["latency_seconds"]["p99"]
+        print(f"  processed {result['processed']} at {result['ingest_rate']:.1f}/s, "
+              f"p99 latency {p99 if p99 is None else round(p99, 3)}s, "
+              f"RSS growth {result['rss_growth_bytes'] / (1024 * 1024):.1f} MB",
+              file=sys.stderr)
+        for violation in result["violations"]:
+            print(f"  FAIL: {violation}", file=sys.stderr)
+            failed = True
+
+    text = json.dumps({"results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()